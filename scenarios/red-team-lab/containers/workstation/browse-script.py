@@ -11,59 +11,115 @@ from selenium import webdriver
 from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 
 def get_browser():
     options = Options()
     options.add_argument('--headless')
     service = Service('/usr/local/bin/geckodriver')
-    return webdriver.Firefox(options=options, service=service)
+    browser = webdriver.Firefox(options=options, service=service)
+    browser.set_page_load_timeout(30)
+    return browser
 
-def browse_wordpress():
-    wordpress_url = os.environ.get('WORDPRESS_URL', 'http://wordpress')
-    print(f"[*] Starting simulated browsing to {wordpress_url}")
+def wait_for_page(browser, timeout=10):
+    """Block until the current page has finished loading."""
+    WebDriverWait(browser, timeout).until(
+        lambda d: d.execute_script('return document.readyState') == 'complete'
+    )
+
+def read_page(low, high):
+    """Linger on a loaded page like a user reading it.
 
-    browser = get_browser()
+    The page has to stay open for a while so injected hooks get a chance
+    to load and phone home; this is think time, not a load wait.
+    """
+    time.sleep(random.uniform(low, high))
+
+def browse_wordpress(browser, wordpress_url):
+    print(f"[*] Starting simulated browsing to {wordpress_url}")
 
     try:
         print(f"[*] Visiting homepage...")
         browser.get(wordpress_url)
-        time.sleep(random.uniform(2, 5))
+        read_page(2, 5)
 
         print(f"[*] Visiting employee directory...")
         browser.get(f"{wordpress_url}/employees/")
-        time.sleep(random.uniform(3, 8))
+        read_page(3, 8)
 
         try:
             links = browser.find_elements(By.TAG_NAME, 'a')
             if links:
                 link = random.choice(links[:5])
+                page = browser.find_element(By.TAG_NAME, 'html')
+                # Unlike get(), click() doesn't wait for the next page, so wait
+                # for it here - but only if the link leads to another page
+                href = link.get_attribute('href') or ''
+                navigates = (href.startswith('http')
+                             and href.split('#')[0] != browser.current_url.split('#')[0])
                 link.click()
-                time.sleep(random.uniform(2, 5))
+                if navigates:
+                    try:
+                        WebDriverWait(browser, 5).until(EC.staleness_of(page))
+                        wait_for_page(browser)
+                    except TimeoutException:
+                        pass
+                read_page(2, 5)
         except Exception as e:
             print(f"[!] Error clicking: {e}")
 
         print(f"[*] Searching employee directory...")
         browser.get(f"{wordpress_url}/employees/?search=IT")
-        time.sleep(random.uniform(3, 6))
+        read_page(3, 6)
 
-    except Exception as e:
-        print(f"[!] Browser error: {e}")
+    except TimeoutException as e:
+        print(f"[!] Page load timed out: {e}")
+    # Any other error is left to the caller, which rebuilds the browser
     finally:
-        browser.quit()
+        # Drop the site's cookies (only the current domain's can be cleared,
+        # so do it while still on it), then leave the site so injected hooks
+        # are only online during a browse cycle, not between them. If the
+        # session is dead this fails too; don't hide the original error.
+        try:
+            browser.delete_all_cookies()
+            browser.get('about:blank')
+        except Exception as e:
+            print(f"[!] Cleanup failed: {e}")
 
 def main():
+    wordpress_url = os.environ.get('WORDPRESS_URL', 'http://wordpress')
     interval = int(os.environ.get('BROWSE_INTERVAL', '60'))
     print(f"[*] Workstation simulation started, interval: {interval}s")
 
-    while True:
-        try:
-            browse_wordpress()
-        except Exception as e:
-            print(f"[!] Error in browse cycle: {e}")
+    # Reuse one Firefox process across cycles instead of paying the
+    # geckodriver + browser startup cost every time
+    browser = None
+    try:
+        while True:
+            try:
+                if browser is None:
+                    browser = get_browser()
+                browse_wordpress(browser, wordpress_url)
+            except Exception as e:
+                # Anything escaping browse_wordpress means the browser itself
+                # is in trouble (e.g. geckodriver died and urllib3 raised a
+                # connection error), so start a fresh one next cycle
+                print(f"[!] Browser failure, restarting browser: {e}")
+                if browser is not None:
+                    try:
+                        browser.quit()
+                    except Exception:
+                        pass
+                browser = None
 
-        sleep_time = interval + random.randint(-10, 10)
-        print(f"[*] Sleeping {sleep_time} seconds...")
-        time.sleep(sleep_time)
+            sleep_time = interval + random.randint(-10, 10)
+            print(f"[*] Sleeping {sleep_time} seconds...")
+            time.sleep(sleep_time)
+    finally:
+        if browser is not None:
+            browser.quit()
 
 if __name__ == '__main__':
     main()
@@ -15,6 +15,12 @@ Usage:
     # Run the import (syncs images + creates range)
     python import-to-cyroid.py --local
 
+    # Limit concurrent API requests (e.g. for a rate-limited instance)
+    python import-to-cyroid.py --local --concurrency 2
+
+    # Re-sync images even if the library already has them all
+    python import-to-cyroid.py --local --refresh-images
+
     # Import and auto-deploy
     python import-to-cyroid.py --local --deploy
 
@@ -28,15 +34,27 @@ Usage:
 import os
 import sys
 import json
+import ipaddress
 import argparse
+import random
+import re
 import subprocess
 import time
-import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 SCENARIOS_DIR = SCRIPT_DIR.parent
 
+# Default upper bound on concurrent API requests during import
+# (override with --concurrency or CYROID_CONCURRENCY)
+MAX_WORKERS = 8
+
+# Deploy status polling: start fast, back off to at most POLL_MAX_DELAY seconds
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 15.0
+
 
 # =============================================================================
 # Image Definitions
@@ -119,13 +137,19 @@ def check_docker_images(dc_type: str = "samba") -> bool:
     missing = []
     present = []
 
+    # A single inspect call covers every image: docker prints the tags of
+    # the images it found and reports the rest on stderr (non-zero exit)
+    result = subprocess.run(
+        ["docker", "image", "inspect",
+         "--format", "{{range .RepoTags}}{{println .}}{{end}}",
+         *required_images],
+        capture_output=True,
+        text=True
+    )
+    local_tags = set(result.stdout.split())
+
     for image in required_images:
-        result = subprocess.run(
-            ["docker", "image", "inspect", image],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
+        if image in local_tags:
             present.append(image)
             print(f"  [OK]      {image}")
         else:
@@ -150,110 +174,246 @@ def check_docker_images(dc_type: str = "samba") -> bool:
 # Range Blueprint
 # =============================================================================
 
+# VMs reference images by docker_image_tag, which will be resolved to
+# base_image_id UUIDs during import. Built once at import time and shared;
+# callers must treat it as read-only.
+_RANGE_BLUEPRINT = {
+    "name": "Red Team Training Lab",
+    "description": "Attack training environment: SQLi → Credential theft → Lateral movement → Domain compromise",
+    "base_subnet_prefix": "172.16",
+    "networks": [
+        {"name": "internet", "subnet": "172.16.0.0/24", "gateway": "172.16.0.1", "is_isolated": False},
+        {"name": "dmz", "subnet": "172.16.1.0/24", "gateway": "172.16.1.1", "is_isolated": True},
+        {"name": "internal", "subnet": "172.16.2.0/24", "gateway": "172.16.2.1", "is_isolated": True},
+    ],
+    "vms": [
+        {
+            "hostname": "kali",
+            "docker_image_tag": "redteam-lab-kali:latest",
+            "network_name": "internet",
+            "ip_address": "172.16.0.10",
+            "cpu": 4, "ram_mb": 4096, "disk_gb": 60,
+            "position_x": 100, "position_y": 200,
+        },
+        {
+            "hostname": "redir1",
+            "docker_image_tag": "alpine:3.19",
+            "network_name": "internet",
+            "ip_address": "172.16.0.20",
+            "cpu": 1, "ram_mb": 512, "disk_gb": 10,
+            "position_x": 100, "position_y": 300,
+        },
+        {
+            "hostname": "redir2",
+            "docker_image_tag": "alpine:3.19",
+            "network_name": "internet",
+            "ip_address": "172.16.0.21",
+            "cpu": 1, "ram_mb": 512, "disk_gb": 10,
+            "position_x": 100, "position_y": 400,
+        },
+        {
+            "hostname": "webserver",
+            "docker_image_tag": "redteam-lab-wordpress:latest",
+            "network_name": "dmz",
+            "ip_address": "172.16.1.10",
+            "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
+            "position_x": 400, "position_y": 200,
+            # Multi-homed: also on internet
+            "additional_networks": [
+                {"network_name": "internet", "ip_address": "172.16.0.100"}
+            ],
+        },
+        {
+            "hostname": "dc01",
+            "docker_image_tag": "cyroid/samba-dc:latest",
+            "network_name": "internal",
+            "ip_address": "172.16.2.10",
+            "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
+            "position_x": 700, "position_y": 100,
+        },
+        {
+            "hostname": "fileserver",
+            "docker_image_tag": "redteam-lab-fileserver:latest",
+            "network_name": "internal",
+            "ip_address": "172.16.2.20",
+            "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
+            "position_x": 700, "position_y": 200,
+        },
+        {
+            "hostname": "ws01",
+            "docker_image_tag": "redteam-lab-workstation:latest",
+            "network_name": "internal",
+            "ip_address": "172.16.2.30",
+            "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
+            "position_x": 700, "position_y": 300,
+            # Multi-homed: also on dmz
+            "additional_networks": [
+                {"network_name": "dmz", "ip_address": "172.16.1.30"}
+            ],
+        },
+    ],
+}
+
+
 def get_range_blueprint(dc_type: str = "samba"):
     """
     Get range blueprint configuration.
 
-    VMs reference images by docker_image_tag, which will be resolved to
-    base_image_id UUIDs during import.
+    Returns the shared module-level blueprint; copy.deepcopy() it before
+    making changes.
     """
-    return {
-        "name": "Red Team Training Lab",
-        "description": "Attack training environment: SQLi → Credential theft → Lateral movement → Domain compromise",
-        "base_subnet_prefix": "172.16",
-        "networks": [
-            {"name": "internet", "subnet": "172.16.0.0/24", "gateway": "172.16.0.1", "is_isolated": False},
-            {"name": "dmz", "subnet": "172.16.1.0/24", "gateway": "172.16.1.1", "is_isolated": True},
-            {"name": "internal", "subnet": "172.16.2.0/24", "gateway": "172.16.2.1", "is_isolated": True},
-        ],
-        "vms": [
-            {
-                "hostname": "kali",
-                "docker_image_tag": "redteam-lab-kali:latest",
-                "network_name": "internet",
-                "ip_address": "172.16.0.10",
-                "cpu": 4, "ram_mb": 4096, "disk_gb": 60,
-                "position_x": 100, "position_y": 200,
-            },
-            {
-                "hostname": "redir1",
-                "docker_image_tag": "alpine:3.19",
-                "network_name": "internet",
-                "ip_address": "172.16.0.20",
-                "cpu": 1, "ram_mb": 512, "disk_gb": 10,
-                "position_x": 100, "position_y": 300,
-            },
-            {
-                "hostname": "redir2",
-                "docker_image_tag": "alpine:3.19",
-                "network_name": "internet",
-                "ip_address": "172.16.0.21",
-                "cpu": 1, "ram_mb": 512, "disk_gb": 10,
-                "position_x": 100, "position_y": 400,
-            },
-            {
-                "hostname": "webserver",
-                "docker_image_tag": "redteam-lab-wordpress:latest",
-                "network_name": "dmz",
-                "ip_address": "172.16.1.10",
-                "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
-                "position_x": 400, "position_y": 200,
-                # Multi-homed: also on internet
-                "additional_networks": [
-                    {"network_name": "internet", "ip_address": "172.16.0.100"}
-                ],
-            },
-            {
-                "hostname": "dc01",
-                "docker_image_tag": "cyroid/samba-dc:latest",
-                "network_name": "internal",
-                "ip_address": "172.16.2.10",
-                "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
-                "position_x": 700, "position_y": 100,
-            },
-            {
-                "hostname": "fileserver",
-                "docker_image_tag": "redteam-lab-fileserver:latest",
-                "network_name": "internal",
-                "ip_address": "172.16.2.20",
-                "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
-                "position_x": 700, "position_y": 200,
-            },
-            {
-                "hostname": "ws01",
-                "docker_image_tag": "redteam-lab-workstation:latest",
-                "network_name": "internal",
-                "ip_address": "172.16.2.30",
-                "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
-                "position_x": 700, "position_y": 300,
-                # Multi-homed: also on dmz
-                "additional_networks": [
-                    {"network_name": "dmz", "ip_address": "172.16.1.30"}
-                ],
-            },
-        ],
-    }
+    return _RANGE_BLUEPRINT
+
+
+# RFC 1123 label: what CYROID accepts as a VM hostname
+_HOSTNAME_RE = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?")
+
+
+def validate_blueprint(blueprint: dict) -> list:
+    """
+    Check a blueprint for mistakes the API would reject.
+
+    Catches malformed subnets, hostnames and IPs before any request is made.
+    Returns a list of error messages (empty if the blueprint is valid).
+    """
+    errors = []
+    subnets = {}  # network name -> ip_network
+    reserved = {}  # network name -> {address: what it is}
+
+    for net in blueprint["networks"]:
+        try:
+            subnet = ipaddress.ip_network(net["subnet"])
+        except ValueError as e:
+            errors.append(f"network {net['name']}: invalid subnet ({e})")
+            continue
+        subnets[net["name"]] = subnet
+        reserved[net["name"]] = {}
+        if subnet.num_addresses > 2:  # /31 and /32 have no network/broadcast address
+            reserved[net["name"]][subnet.network_address] = "the network address"
+            reserved[net["name"]][subnet.broadcast_address] = "the broadcast address"
+        try:
+            gateway = ipaddress.ip_address(net["gateway"])
+            if gateway not in subnet:
+                errors.append(f"network {net['name']}: gateway {net['gateway']} not in {subnet}")
+            reserved[net["name"]][gateway] = "the gateway"
+        except ValueError as e:
+            errors.append(f"network {net['name']}: invalid gateway ({e})")
+
+    seen_ips = set()
+    for vm in blueprint["vms"]:
+        hostname = vm["hostname"]
+        if not _HOSTNAME_RE.fullmatch(hostname):
+            errors.append(f"vm {hostname!r}: invalid hostname")
+
+        interfaces = [vm] + vm.get("additional_networks", [])
+        for iface in interfaces:
+            net_name, ip = iface["network_name"], iface["ip_address"]
+            try:
+                addr = ipaddress.ip_address(ip)
+            except ValueError as e:
+                errors.append(f"vm {hostname}: invalid IP address ({e})")
+                continue
+            if ip in seen_ips:
+                errors.append(f"vm {hostname}: IP address {ip} is already in use")
+            seen_ips.add(ip)
+            if net_name not in subnets:
+                if not any(n["name"] == net_name for n in blueprint["networks"]):
+                    errors.append(f"vm {hostname}: unknown network {net_name!r}")
+            elif addr not in subnets[net_name]:
+                errors.append(f"vm {hostname}: {ip} not in {net_name} ({subnets[net_name]})")
+            elif addr in reserved[net_name]:
+                errors.append(f"vm {hostname}: {ip} is {reserved[net_name][addr]} of {net_name}")
+
+    return errors
 
 
 # =============================================================================
 # CYROID API Client
 # =============================================================================
 
+def _error_snippet(resp, limit: int = 4096) -> str:
+    """Return an error response body for display.
+
+    API errors (e.g. FastAPI 422 `detail` lists) are shown in full; only
+    bodies over `limit` bytes, such as HTML error pages from a proxy, are
+    cut short so they don't flood the console.
+    """
+    body = resp.content
+    if len(body) <= limit:
+        return resp.text
+    return body[:limit].decode("utf-8", errors="replace") + f"... ({len(body)} bytes)"
+
+
 class CyroidClient:
     """Client for CYROID API using Image Library."""
 
-    def __init__(self, api_url: str, token: str):
+    def __init__(self, api_url: str, token: str, max_workers: int = MAX_WORKERS):
+        # Imported here so --check-images and --export-json don't pay for
+        # (or require) requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         self.api_url = api_url.rstrip('/')
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
         self._image_cache = {}  # docker_image_tag -> UUID
+        self._etag_cache = {}  # url -> (ETag, parsed JSON body)
+        self.max_workers = max_workers  # cap on in-flight requests
+
+        # One session for all calls so connections are kept alive. Only
+        # idempotent requests are retried; POSTs are never replayed. The pool
+        # is sized so every worker thread can hold its own connection.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=max(16, self.max_workers),
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_json(self, url: str) -> tuple:
+        """GET a JSON resource, revalidating with If-None-Match when possible.
+
+        Returns (status_code, data); data is None unless the request
+        succeeded. A 304 Not Modified reuses the body parsed last time.
+        """
+        etag, cached = self._etag_cache.get(url, (None, None))
+        headers = {"If-None-Match": etag} if etag else None
+        resp = self.session.get(url, headers=headers)
+        if resp.status_code == 304 and etag:
+            return resp.status_code, cached
+        if resp.status_code != 200:
+            return resp.status_code, None
+
+        data = resp.json()
+        if resp.headers.get("ETag"):
+            self._etag_cache[url] = (resp.headers["ETag"], data)
+        return resp.status_code, data
 
     def check_connection(self) -> bool:
         """Verify connection to CYROID API."""
         try:
-            resp = requests.get(f"{self.api_url}/auth/me", headers=self.headers)
+            resp = self.session.get(f"{self.api_url}/auth/me")
             if resp.status_code == 200:
                 user = resp.json()
                 print(f"Connected as: {user.get('username', 'unknown')}")
@@ -272,17 +432,14 @@ class CyroidClient:
         """
         print("\n=== Syncing Images to Library ===")
         try:
-            resp = requests.post(
-                f"{self.api_url}/images/sync-from-cache",
-                headers=self.headers
-            )
+            resp = self.session.post(f"{self.api_url}/images/sync-from-cache")
             if resp.status_code == 200:
                 result = resp.json()
                 print(f"  Docker images synced: {result.get('docker_images_synced', 0)}")
                 print(f"  Total synced: {result.get('total_synced', 0)}")
                 return result
             else:
-                print(f"  Sync failed: {resp.status_code} - {resp.text[:200]}")
+                print(f"  Sync failed: {resp.status_code} - {_error_snippet(resp, 200)}")
                 return {}
         except Exception as e:
             print(f"  Sync error: {e}")
@@ -291,45 +448,40 @@ class CyroidClient:
     def get_base_images(self) -> list:
         """Get all base images from the Image Library."""
         try:
-            resp = requests.get(
-                f"{self.api_url}/images/base",
-                headers=self.headers
-            )
-            if resp.status_code == 200:
-                return resp.json()
+            status, images = self._get_json(f"{self.api_url}/images/base")
+            if images is not None:
+                return images
             else:
-                print(f"Failed to get images: {resp.status_code}")
+                print(f"Failed to get images: {status}")
                 return []
         except Exception as e:
             print(f"Error getting images: {e}")
             return []
 
-    def get_image_id_by_tag(self, docker_image_tag: str) -> str:
-        """Look up a base image UUID by its docker_image_tag."""
-        # Check cache first
-        if docker_image_tag in self._image_cache:
-            return self._image_cache[docker_image_tag]
+    def get_image_map(self, refresh: bool = False) -> dict:
+        """Get a docker_image_tag -> UUID map of the Image Library.
 
-        # Fetch all images and build cache
-        images = self.get_base_images()
-        for img in images:
-            tag = img.get('docker_image_tag')
-            if tag:
-                self._image_cache[tag] = img.get('id')
-
-        return self._image_cache.get(docker_image_tag)
+        The library is listed once and the result is cached on the client;
+        pass refresh=True to list it again.
+        """
+        if refresh or not self._image_cache:
+            self._image_cache = {
+                img["docker_image_tag"]: img.get("id")
+                for img in self.get_base_images()
+                if img.get("docker_image_tag")
+            }
+        return self._image_cache
 
     def create_range(self, name: str, description: str) -> dict:
         """Create a new range."""
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.api_url}/ranges",
-            headers=self.headers,
             json={"name": name, "description": description}
         )
         if resp.status_code in (200, 201):
             return resp.json()
         else:
-            print(f"Failed to create range: {resp.status_code} - {resp.text}")
+            print(f"Failed to create range: {resp.status_code} - {_error_snippet(resp)}")
             return None
 
     def create_network(self, range_id: str, network: dict) -> dict:
@@ -341,15 +493,14 @@ class CyroidClient:
             "gateway": network["gateway"],
             "is_isolated": network.get("is_isolated", True),
         }
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.api_url}/networks",
-            headers=self.headers,
             json=network_data
         )
         if resp.status_code in (200, 201):
             return resp.json()
         else:
-            print(f"  Failed to create network: {resp.status_code} - {resp.text}")
+            print(f"  Failed to create network {network['name']}: {resp.status_code} - {_error_snippet(resp)}")
             return None
 
     def create_vm(self, range_id: str, network_id: str, vm: dict, base_image_id: str) -> dict:
@@ -366,70 +517,58 @@ class CyroidClient:
             "position_x": vm.get("position_x", 0),
             "position_y": vm.get("position_y", 0),
         }
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.api_url}/vms",
-            headers=self.headers,
             json=vm_data
         )
         if resp.status_code in (200, 201):
             return resp.json()
         else:
-            print(f"  Failed to create VM: {resp.status_code} - {resp.text}")
+            print(f"  Failed to create VM {vm['hostname']}: {resp.status_code} - {_error_snippet(resp)}")
             return None
 
-    def attach_network_to_vm(self, vm_id: str, network_id: str, ip_address: str) -> bool:
+    def attach_network_to_vm(self, vm_id: str, network_id: str, ip_address: str,
+                             hostname: str = None) -> bool:
         """Attach an additional network interface to a running VM.
 
-        Note: VM must be in RUNNING state for this to work.
+        Note: VM must be in RUNNING state for this to work. hostname is only
+        used to label error output.
         """
         # API format: POST /vms/{vm_id}/networks/{network_id}?ip_address={ip}
         url = f"{self.api_url}/vms/{vm_id}/networks/{network_id}"
         if ip_address:
             url += f"?ip_address={ip_address}"
-        resp = requests.post(url, headers=self.headers)
+        resp = self.session.post(url)
         if resp.status_code in (200, 201):
             return True
         else:
-            print(f"    Failed to attach network: {resp.status_code} - {resp.text}")
+            print(f"    Failed to attach network to {hostname or vm_id} ({ip_address}): "
+                  f"{resp.status_code} - {_error_snippet(resp)}")
             return False
 
     def deploy_range(self, range_id: str) -> bool:
         """Deploy a range (start all VMs)."""
-        resp = requests.post(
-            f"{self.api_url}/ranges/{range_id}/deploy",
-            headers=self.headers
-        )
+        resp = self.session.post(f"{self.api_url}/ranges/{range_id}/deploy")
         if resp.status_code in (200, 201, 202):
             return True
         else:
-            print(f"Failed to deploy: {resp.status_code} - {resp.text}")
+            print(f"Failed to deploy: {resp.status_code} - {_error_snippet(resp)}")
             return False
 
     def get_range_status(self, range_id: str) -> dict:
         """Get range status including VM states."""
-        resp = requests.get(
-            f"{self.api_url}/ranges/{range_id}",
-            headers=self.headers
-        )
-        if resp.status_code == 200:
-            return resp.json()
-        return None
+        _, range_obj = self._get_json(f"{self.api_url}/ranges/{range_id}")
+        return range_obj
 
     def get_range_vms(self, range_id: str) -> list:
         """Get all VMs in a range."""
-        resp = requests.get(
-            f"{self.api_url}/ranges/{range_id}/vms",
-            headers=self.headers
-        )
-        if resp.status_code == 200:
-            return resp.json()
-        return []
+        _, vms = self._get_json(f"{self.api_url}/ranges/{range_id}/vms")
+        return vms if vms is not None else []
 
     def create_blueprint_from_range(self, range_id: str, name: str, base_subnet_prefix: str) -> dict:
         """Create a blueprint from an existing range."""
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.api_url}/blueprints",
-            headers=self.headers,
             json={
                 "range_id": range_id,
                 "name": name,
@@ -439,30 +578,26 @@ class CyroidClient:
         if resp.status_code in (200, 201):
             return resp.json()
         else:
-            print(f"Failed to create blueprint: {resp.status_code} - {resp.text}")
+            print(f"Failed to create blueprint: {resp.status_code} - {_error_snippet(resp)}")
             return None
 
     def list_blueprints(self) -> list:
         """List all blueprints."""
-        resp = requests.get(
-            f"{self.api_url}/blueprints",
-            headers=self.headers
-        )
+        resp = self.session.get(f"{self.api_url}/blueprints")
         if resp.status_code == 200:
             return resp.json()
         return []
 
     def deploy_blueprint_instance(self, blueprint_id: str, name: str) -> dict:
         """Deploy a new instance from a blueprint."""
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.api_url}/blueprints/{blueprint_id}/deploy",
-            headers=self.headers,
             json={"name": name, "auto_deploy": True}
         )
         if resp.status_code in (200, 201):
             return resp.json()
         else:
-            print(f"Failed to deploy blueprint: {resp.status_code} - {resp.text}")
+            print(f"Failed to deploy blueprint: {resp.status_code} - {_error_snippet(resp)}")
             return None
 
 
@@ -470,7 +605,8 @@ class CyroidClient:
 # Import Logic
 # =============================================================================
 
-def import_range(client: CyroidClient, blueprint: dict, range_name: str = None) -> tuple:
+def import_range(client: CyroidClient, blueprint: dict, range_name: str = None,
+                 force_sync: bool = False) -> tuple:
     """
     Import a range from blueprint using the Image Library.
 
@@ -479,24 +615,39 @@ def import_range(client: CyroidClient, blueprint: dict, range_name: str = None)
     """
     pending_attachments = []  # Store multi-homed network attachments for after deployment
 
-    # Step 1: Sync images to library
-    client.sync_images_from_cache()
+    # Reject malformed blueprints before touching the API
+    errors = validate_blueprint(blueprint)
+    if errors:
+        print("\nERROR: Blueprint is invalid:")
+        for error in errors:
+            print(f"  - {error}")
+        return (None, [])
+
+    # Step 1: Sync images to library, unless the library already has every
+    # image this blueprint needs (e.g. from a previous run)
+    # Unique tags in blueprint order; several VMs can share one image
+    required_tags = list(dict.fromkeys(vm["docker_image_tag"] for vm in blueprint["vms"]))
+    available = {} if force_sync else client.get_image_map()
+    if not force_sync and all(tag in available for tag in required_tags):
+        print("\n=== Syncing Images to Library ===")
+        print("  Skipped: all images already in the library (use --refresh-images to force)")
+    else:
+        client.sync_images_from_cache()
+        available = client.get_image_map(refresh=True)
 
     # Step 2: Verify all required images exist
     print("\n=== Verifying Image Library ===")
     missing_images = []
     image_map = {}  # docker_image_tag -> UUID
 
-    for vm in blueprint["vms"]:
-        tag = vm["docker_image_tag"]
-        if tag not in image_map:
-            image_id = client.get_image_id_by_tag(tag)
-            if image_id:
-                image_map[tag] = image_id
-                print(f"  [OK] {tag} -> {image_id[:8]}...")
-            else:
-                missing_images.append(tag)
-                print(f"  [MISSING] {tag}")
+    for tag in required_tags:
+        image_id = available.get(tag)
+        if image_id:
+            image_map[tag] = image_id
+            print(f"  [OK] {tag} -> {image_id[:8]}...")
+        else:
+            missing_images.append(tag)
+            print(f"  [MISSING] {tag}")
 
     if missing_images:
         print()
@@ -524,15 +675,26 @@ def import_range(client: CyroidClient, blueprint: dict, range_name: str = None)
     print("\n=== Creating Networks ===")
     network_map = {}  # network_name -> network_id
 
+    # Networks are independent of each other, so create them concurrently
     for net in blueprint["networks"]:
         print(f"  [CREATE] {net['name']} ({net['subnet']})")
-        result = client.create_network(range_id, net)
+    with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+        results = list(executor.map(
+            lambda net: client.create_network(range_id, net),
+            blueprint["networks"]
+        ))
+
+    for net, result in zip(blueprint["networks"], results):
         if result:
             network_map[net["name"]] = result["id"]
 
     # Step 5: Create VMs
     print("\n=== Creating VMs ===")
 
+    # Resolve every VM's image and network IDs up front. VMs only depend on
+    # networks that already exist, so the create step below can run them
+    # concurrently and do nothing but issue requests.
+    to_create = []  # (vm, network_id, base_image_id, [(add_net, add_network_id), ...])
     for vm in blueprint["vms"]:
         tag = vm["docker_image_tag"]
         base_image_id = image_map.get(tag)
@@ -542,6 +704,12 @@ def import_range(client: CyroidClient, blueprint: dict, range_name: str = None)
             print(f"  [SKIP] {vm['hostname']} - missing image or network")
             continue
 
+        extra_networks = [
+            (add_net, network_map[add_net["network_name"]])
+            for add_net in vm.get("additional_networks", [])
+            if add_net["network_name"] in network_map
+        ]
+
         additional_ips = ""
         if "additional_networks" in vm:
             additional_ips = " + " + ", ".join(
@@ -549,42 +717,59 @@ def import_range(client: CyroidClient, blueprint: dict, range_name: str = None)
             )
 
         print(f"  [CREATE] {vm['hostname']} ({vm['ip_address']}{additional_ips})")
-        result = client.create_vm(range_id, network_id, vm, base_image_id)
+        to_create.append((vm, network_id, base_image_id, extra_networks))
+
+    with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+        results = list(executor.map(
+            lambda item: client.create_vm(range_id, item[1], item[0], item[2]),
+            to_create
+        ))
 
+    for (vm, _, _, extra_networks), result in zip(to_create, results):
         # Store pending network attachments (will be applied after VMs are running)
-        if result and "additional_networks" in vm:
-            vm_id = result["id"]
-            for add_net in vm["additional_networks"]:
-                add_network_id = network_map.get(add_net["network_name"])
-                if add_network_id:
-                    pending_attachments.append({
-                        "vm_id": vm_id,
-                        "vm_hostname": vm["hostname"],
-                        "network_id": add_network_id,
-                        "network_name": add_net["network_name"],
-                        "ip_address": add_net["ip_address"]
-                    })
+        if not result:
+            continue
+        for add_net, add_network_id in extra_networks:
+            pending_attachments.append({
+                "vm_id": result["id"],
+                "vm_hostname": vm["hostname"],
+                "network_id": add_network_id,
+                "network_name": add_net["network_name"],
+                "ip_address": add_net["ip_address"]
+            })
 
     return range_id, pending_attachments
 
 
 def apply_pending_attachments(client: CyroidClient, pending_attachments: list) -> bool:
-    """Apply pending network attachments to running VMs (for multi-homed VMs)."""
+    """Apply pending network attachments to running VMs (for multi-homed VMs).
+
+    May be called once per batch; the caller prints the section header.
+    """
     if not pending_attachments:
         return True
 
-    print("\n=== Attaching Additional Networks ===")
-    success = True
     for attach in pending_attachments:
         print(f"  {attach['vm_hostname']}: attaching to {attach['network_name']} ({attach['ip_address']})")
-        if not client.attach_network_to_vm(
-            attach['vm_id'],
-            attach['network_id'],
-            attach['ip_address']
-        ):
-            success = False
 
-    return success
+    with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+        results = list(executor.map(
+            lambda attach: client.attach_network_to_vm(
+                attach['vm_id'],
+                attach['network_id'],
+                attach['ip_address'],
+                hostname=attach['vm_hostname'],
+            ),
+            pending_attachments
+        ))
+
+    return all(results)
+
+
+def _poll_sleep(delay: float) -> float:
+    """Sleep for delay (plus up to 10% jitter) and return the next delay."""
+    time.sleep(delay + random.uniform(0, delay * 0.1))
+    return min(delay * 1.5, POLL_MAX_DELAY)
 
 
 def deploy_and_wait(client: CyroidClient, range_id: str, pending_attachments: list = None, timeout: int = 300) -> bool:
@@ -593,7 +778,7 @@ def deploy_and_wait(client: CyroidClient, range_id: str, pending_attachments: li
     Args:
         client: CYROID API client
         range_id: ID of the range to deploy
-        pending_attachments: List of network attachments to apply after VMs are running
+        pending_attachments: List of network attachments, each applied once its VM is running
         timeout: Timeout in seconds for waiting
     """
     print("\n=== Deploying Range ===")
@@ -603,40 +788,67 @@ def deploy_and_wait(client: CyroidClient, range_id: str, pending_attachments: li
 
     print("  Deployment started, waiting for VMs...")
 
+    remaining_attachments = list(pending_attachments or [])
+    attachments_ok = True
+    attach_header_shown = False
+
+    delay = POLL_INITIAL_DELAY
+    last_status_str = None
     start_time = time.time()
     while time.time() - start_time < timeout:
         vms = client.get_range_vms(range_id)
         if not vms:
-            time.sleep(5)
+            delay = _poll_sleep(delay)
             continue
 
-        statuses = {}
-        for vm in vms:
-            status = vm.get("status", "unknown")
-            statuses[status] = statuses.get(status, 0) + 1
+        statuses = Counter(vm.get("status", "unknown") for vm in vms)
 
         total = len(vms)
-        running = statuses.get("running", 0)
+        running = statuses["running"]
 
+        # Only report when something changed, not on every poll
         status_str = ", ".join(f"{k}:{v}" for k, v in sorted(statuses.items()))
-        print(f"  VMs: {running}/{total} running ({status_str})")
+        changed = status_str != last_status_str
+        last_status_str = status_str
+        if changed:
+            print(f"  VMs: {running}/{total} running ({status_str})")
+
+        # Attach additional networks as soon as each VM is running, instead
+        # of waiting for the slowest VM in the range
+        if remaining_attachments:
+            running_ids = {vm.get("id") for vm in vms if vm.get("status") == "running"}
+            ready = [a for a in remaining_attachments if a["vm_id"] in running_ids]
+            if ready:
+                remaining_attachments = [
+                    a for a in remaining_attachments if a["vm_id"] not in running_ids
+                ]
+                if not attach_header_shown:
+                    print("\n=== Attaching Additional Networks ===")
+                    attach_header_shown = True
+                if not apply_pending_attachments(client, ready):
+                    attachments_ok = False
 
         if running == total:
+            # Attachments for VMs that never appeared in the listing: try
+            # them anyway rather than dropping them silently
+            if remaining_attachments:
+                print(f"\n  Warning: {len(remaining_attachments)} attachment(s) are for VMs "
+                      "not in the range listing; trying them anyway")
+                if not attach_header_shown:
+                    print("\n=== Attaching Additional Networks ===")
+                if not apply_pending_attachments(client, remaining_attachments):
+                    attachments_ok = False
             print("\n  All VMs running!")
-
-            # Apply pending network attachments now that VMs are running
-            if pending_attachments:
-                if not apply_pending_attachments(client, pending_attachments):
-                    print("  Warning: Some network attachments failed")
-
+            if not attachments_ok:
+                print("  Warning: Some network attachments failed")
             return True
 
         # Check for failures
-        failed = statuses.get("failed", 0) + statuses.get("error", 0)
-        if failed > 0:
+        failed = statuses["failed"] + statuses["error"]
+        if failed > 0 and changed:
             print(f"\n  WARNING: {failed} VM(s) failed to start")
 
-        time.sleep(5)
+        delay = _poll_sleep(delay)
 
     print(f"\n  Timeout after {timeout}s")
     return False
@@ -669,6 +881,17 @@ def show_range_info(client: CyroidClient, range_id: str):
 # Main
 # =============================================================================
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description="Import Red Team Lab into CYROID (v0.13+)")
     parser.add_argument("--api-url", default=os.environ.get("CYROID_API_URL", "http://localhost/api/v1"))
@@ -683,6 +906,11 @@ def main():
                         choices=["windows", "samba"],
                         help="Domain Controller type (default: samba)")
     parser.add_argument("--export-json", help="Export blueprint as JSON file")
+    parser.add_argument("--refresh-images", action="store_true",
+                        help="Sync images to the Image Library even if it already has them")
+    parser.add_argument("--concurrency", type=positive_int,
+                        default=os.environ.get("CYROID_CONCURRENCY", str(MAX_WORKERS)),
+                        help=f"Max concurrent API requests (default: {MAX_WORKERS})")
 
     args = parser.parse_args()
 
@@ -714,64 +942,64 @@ def main():
     print(f"DC Type: {args.dc_type}")
     print()
 
-    client = CyroidClient(args.api_url, args.token)
-    if not client.check_connection():
-        sys.exit(1)
+    with CyroidClient(args.api_url, args.token, max_workers=args.concurrency) as client:
+        if not client.check_connection():
+            sys.exit(1)
 
-    # Get blueprint
-    blueprint = get_range_blueprint(dc_type=args.dc_type)
+        # Get blueprint
+        blueprint = get_range_blueprint(dc_type=args.dc_type)
 
-    # Import the range
-    result = import_range(client, blueprint, args.range_name)
-    if not result or result[0] is None:
-        print("\nImport failed!")
-        sys.exit(1)
+        # Import the range
+        result = import_range(client, blueprint, args.range_name, force_sync=args.refresh_images)
+        if not result or result[0] is None:
+            print("\nImport failed!")
+            sys.exit(1)
 
-    range_id, pending_attachments = result
-
-    print(f"\n=== Import Complete ===")
-    print(f"Range ID: {range_id}")
-    if pending_attachments:
-        print(f"Pending network attachments: {len(pending_attachments)} (will be applied after deployment)")
-
-    # Create blueprint if requested (for future GUI deployments)
-    blueprint_id = None
-    if args.create_blueprint:
-        print("\n=== Creating Blueprint ===")
-        blueprint_name = f"{blueprint['name']} Blueprint"
-        bp = client.create_blueprint_from_range(
-            range_id=range_id,
-            name=blueprint_name,
-            base_subnet_prefix=blueprint["base_subnet_prefix"]
-        )
-        if bp:
-            blueprint_id = bp["id"]
-            print(f"  Created: {blueprint_name}")
-            print(f"  Blueprint ID: {blueprint_id}")
-            print()
-            print("  You can now deploy new instances from this blueprint via GUI:")
-            print("    1. Go to Blueprints page in CYROID")
-            print(f"    2. Find '{blueprint_name}'")
-            print("    3. Click 'Deploy Instance'")
-        else:
-            print("  Failed to create blueprint (range still created)")
+        range_id, pending_attachments = result
+
+        print(f"\n=== Import Complete ===")
+        print(f"Range ID: {range_id}")
+        if pending_attachments:
+            print(f"Pending network attachments: {len(pending_attachments)} (will be applied after deployment)")
+
+        # Create blueprint if requested (for future GUI deployments)
+        blueprint_id = None
+        if args.create_blueprint:
+            print("\n=== Creating Blueprint ===")
+            blueprint_name = f"{blueprint['name']} Blueprint"
+            bp = client.create_blueprint_from_range(
+                range_id=range_id,
+                name=blueprint_name,
+                base_subnet_prefix=blueprint["base_subnet_prefix"]
+            )
+            if bp:
+                blueprint_id = bp["id"]
+                print(f"  Created: {blueprint_name}")
+                print(f"  Blueprint ID: {blueprint_id}")
+                print()
+                print("  You can now deploy new instances from this blueprint via GUI:")
+                print("    1. Go to Blueprints page in CYROID")
+                print(f"    2. Find '{blueprint_name}'")
+                print("    3. Click 'Deploy Instance'")
+            else:
+                print("  Failed to create blueprint (range still created)")
 
-    # Deploy if requested
-    if args.deploy:
-        success = deploy_and_wait(client, range_id, pending_attachments)
-        if success:
-            show_range_info(client, range_id)
+        # Deploy if requested
+        if args.deploy:
+            success = deploy_and_wait(client, range_id, pending_attachments)
+            if success:
+                show_range_info(client, range_id)
+            else:
+                print("\nDeployment had issues. Check CYROID UI for details.")
+                sys.exit(1)
         else:
-            print("\nDeployment had issues. Check CYROID UI for details.")
-            sys.exit(1)
-    else:
-        print()
-        print("Range created but not deployed.")
-        print("To deploy, either:")
-        print(f"  - Run: python import-to-cyroid.py --local --deploy")
-        print(f"  - Or use the CYROID UI to deploy the range")
-        if blueprint_id:
-            print(f"  - Or deploy new instances from the blueprint via GUI")
+            print()
+            print("Range created but not deployed.")
+            print("To deploy, either:")
+            print(f"  - Run: python import-to-cyroid.py --local --deploy")
+            print(f"  - Or use the CYROID UI to deploy the range")
+            if blueprint_id:
+                print(f"  - Or deploy new instances from the blueprint via GUI")
 
 
 if __name__ == "__main__":
@@ -5,199 +5,228 @@ Package Red Team Training Lab as a CYROID blueprint with Dockerfiles.
 Creates a self-contained blueprint ZIP that CYROID can import and automatically
 build all required container images.
 """
+import hashlib
 import json
 import os
-import shutil
-import tempfile
+import re
+import stat
 import zipfile
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 CONTAINERS_DIR = SCRIPT_DIR.parent / "containers"
 OUTPUT_DIR = SCRIPT_DIR.parent.parent.parent  # Root of repo
 
+# Everything in the blueprint is text, so use maximum deflate. Not zstd:
+# CYROID's importer must be able to read the archive.
+ZIP_COMPRESSION = zipfile.ZIP_DEFLATED
+ZIP_COMPRESSLEVEL = 9
+
+# Fixed entry timestamp so unchanged inputs give byte-identical entries
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Context files are streamed into the archive in chunks of this size
+COPY_CHUNK_SIZE = 1 << 20
+
+# Always sent by docker build, even if .dockerignore lists them
+ALWAYS_IN_CONTEXT = {"Dockerfile", ".dockerignore"}
+
+# Never packaged into a Dockerfile context, with or without a .dockerignore
+DEFAULT_CONTEXT_IGNORE = {
+    ".git", "__pycache__", ".venv", "venv", "node_modules", ".mypy_cache", ".pytest_cache",
+}
+
+
+# Blueprint and templates are static: built once at import time and shared,
+# so callers must treat them as read-only.
+_BLUEPRINT_CONFIG = {
+    "name": "Red Team Training Lab",
+    "description": "Complete red team training environment with Kali attack box, "
+                  "WordPress SQLi target, Samba DC, file server, and victim workstation. "
+                  "Attack path: SQLi → Credential theft → Lateral movement → Domain compromise",
+    "version": 1,
+    "base_subnet_prefix": "172.16",
+    "next_offset": 0,
+    "config": {
+        "networks": [
+            {"name": "internet", "subnet": "172.16.0.0/24", "gateway": "172.16.0.1", "is_isolated": True},
+            {"name": "dmz", "subnet": "172.16.1.0/24", "gateway": "172.16.1.1", "is_isolated": True},
+            {"name": "internal", "subnet": "172.16.2.0/24", "gateway": "172.16.2.1", "is_isolated": True},
+        ],
+        "vms": [
+            {
+                "hostname": "kali",
+                "ip_address": "172.16.0.10",
+                "network_name": "internet",
+                "template_name": "Red Team - Kali Attack Box",
+                "cpu": 4, "ram_mb": 4096, "disk_gb": 60,
+                "position_x": 100, "position_y": 200,
+            },
+            {
+                "hostname": "redir1",
+                "ip_address": "172.16.0.20",
+                "network_name": "internet",
+                "template_name": "Red Team - Redirector",
+                "cpu": 1, "ram_mb": 512, "disk_gb": 10,
+                "position_x": 100, "position_y": 300,
+            },
+            {
+                "hostname": "redir2",
+                "ip_address": "172.16.0.21",
+                "network_name": "internet",
+                "template_name": "Red Team - Redirector",
+                "cpu": 1, "ram_mb": 512, "disk_gb": 10,
+                "position_x": 100, "position_y": 400,
+            },
+            {
+                "hostname": "webserver",
+                "ip_address": "172.16.1.10",
+                "network_name": "dmz",
+                "template_name": "Red Team - WordPress Target",
+                "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
+                "position_x": 400, "position_y": 200,
+            },
+            {
+                "hostname": "dc01",
+                "ip_address": "172.16.2.10",
+                "network_name": "internal",
+                "template_name": "Samba DC",
+                "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
+                "position_x": 700, "position_y": 100,
+            },
+            {
+                "hostname": "fileserver",
+                "ip_address": "172.16.2.20",
+                "network_name": "internal",
+                "template_name": "Red Team - File Server",
+                "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
+                "position_x": 700, "position_y": 200,
+            },
+            {
+                "hostname": "ws01",
+                "ip_address": "172.16.2.30",
+                "network_name": "internal",
+                "template_name": "Red Team - Victim Workstation",
+                "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
+                "position_x": 700, "position_y": 300,
+            },
+        ],
+        "router": {"enabled": True, "dhcp_enabled": False},
+        "msel": None,
+    }
+}
+
 
 def get_blueprint_config():
     """Return the blueprint configuration."""
-    return {
-        "name": "Red Team Training Lab",
-        "description": "Complete red team training environment with Kali attack box, "
-                      "WordPress SQLi target, Samba DC, file server, and victim workstation. "
-                      "Attack path: SQLi → Credential theft → Lateral movement → Domain compromise",
-        "version": 1,
-        "base_subnet_prefix": "172.16",
-        "next_offset": 0,
-        "config": {
-            "networks": [
-                {"name": "internet", "subnet": "172.16.0.0/24", "gateway": "172.16.0.1", "is_isolated": True},
-                {"name": "dmz", "subnet": "172.16.1.0/24", "gateway": "172.16.1.1", "is_isolated": True},
-                {"name": "internal", "subnet": "172.16.2.0/24", "gateway": "172.16.2.1", "is_isolated": True},
-            ],
-            "vms": [
-                {
-                    "hostname": "kali",
-                    "ip_address": "172.16.0.10",
-                    "network_name": "internet",
-                    "template_name": "Red Team - Kali Attack Box",
-                    "cpu": 4, "ram_mb": 4096, "disk_gb": 60,
-                    "position_x": 100, "position_y": 200,
-                },
-                {
-                    "hostname": "redir1",
-                    "ip_address": "172.16.0.20",
-                    "network_name": "internet",
-                    "template_name": "Red Team - Redirector",
-                    "cpu": 1, "ram_mb": 512, "disk_gb": 10,
-                    "position_x": 100, "position_y": 300,
-                },
-                {
-                    "hostname": "redir2",
-                    "ip_address": "172.16.0.21",
-                    "network_name": "internet",
-                    "template_name": "Red Team - Redirector",
-                    "cpu": 1, "ram_mb": 512, "disk_gb": 10,
-                    "position_x": 100, "position_y": 400,
-                },
-                {
-                    "hostname": "webserver",
-                    "ip_address": "172.16.1.10",
-                    "network_name": "dmz",
-                    "template_name": "Red Team - WordPress Target",
-                    "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
-                    "position_x": 400, "position_y": 200,
-                },
-                {
-                    "hostname": "dc01",
-                    "ip_address": "172.16.2.10",
-                    "network_name": "internal",
-                    "template_name": "Samba DC",
-                    "cpu": 2, "ram_mb": 2048, "disk_gb": 20,
-                    "position_x": 700, "position_y": 100,
-                },
-                {
-                    "hostname": "fileserver",
-                    "ip_address": "172.16.2.20",
-                    "network_name": "internal",
-                    "template_name": "Red Team - File Server",
-                    "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
-                    "position_x": 700, "position_y": 200,
-                },
-                {
-                    "hostname": "ws01",
-                    "ip_address": "172.16.2.30",
-                    "network_name": "internal",
-                    "template_name": "Red Team - Victim Workstation",
-                    "cpu": 1, "ram_mb": 1024, "disk_gb": 10,
-                    "position_x": 700, "position_y": 300,
-                },
-            ],
-            "router": {"enabled": True, "dhcp_enabled": False},
-            "msel": None,
-        }
-    }
+    return _BLUEPRINT_CONFIG
+
+
+# A tuple so it can't be appended to by accident; json.dumps writes it as a list
+_TEMPLATES = (
+    {
+        "name": "Red Team - Kali Attack Box",
+        "description": "Kali Linux with pre-installed attack tools",
+        "os_type": "linux",
+        "os_variant": "Kali Linux",
+        "base_image": "redteam-lab-kali:latest",
+        "vm_type": "container",
+        "linux_distro": "kali",
+        "boot_mode": None,
+        "disk_type": None,
+        "default_cpu": 4,
+        "default_ram_mb": 4096,
+        "default_disk_gb": 60,
+        "config_script": None,
+        "tags": ["attack", "kali", "red-team"],
+    },
+    {
+        "name": "Red Team - Redirector",
+        "description": "Lightweight Alpine redirector for C2 traffic",
+        "os_type": "linux",
+        "os_variant": "Alpine Linux",
+        "base_image": "alpine:latest",
+        "vm_type": "container",
+        "linux_distro": "alpine",
+        "boot_mode": None,
+        "disk_type": None,
+        "default_cpu": 1,
+        "default_ram_mb": 512,
+        "default_disk_gb": 10,
+        "config_script": "apk add --no-cache socat iptables && echo 1 > /proc/sys/net/ipv4/ip_forward",
+        "tags": ["redirector", "c2", "red-team"],
+    },
+    {
+        "name": "Red Team - WordPress Target",
+        "description": "WordPress with SQL injection vulnerabilities",
+        "os_type": "linux",
+        "os_variant": "Ubuntu 22.04",
+        "base_image": "redteam-lab-wordpress:latest",
+        "vm_type": "container",
+        "linux_distro": "ubuntu",
+        "boot_mode": None,
+        "disk_type": None,
+        "default_cpu": 2,
+        "default_ram_mb": 2048,
+        "default_disk_gb": 20,
+        "config_script": None,
+        "tags": ["target", "wordpress", "sqli"],
+    },
+    {
+        "name": "Red Team - File Server",
+        "description": "Samba file server with sensitive data",
+        "os_type": "linux",
+        "os_variant": "Ubuntu 22.04",
+        "base_image": "redteam-lab-fileserver:latest",
+        "vm_type": "container",
+        "linux_distro": "ubuntu",
+        "boot_mode": None,
+        "disk_type": None,
+        "default_cpu": 1,
+        "default_ram_mb": 1024,
+        "default_disk_gb": 10,
+        "config_script": None,
+        "tags": ["target", "fileserver", "smb"],
+    },
+    {
+        "name": "Red Team - Victim Workstation",
+        "description": "Simulated workstation that browses web periodically",
+        "os_type": "linux",
+        "os_variant": "Ubuntu 22.04",
+        "base_image": "redteam-lab-workstation:latest",
+        "vm_type": "container",
+        "linux_distro": "ubuntu",
+        "boot_mode": None,
+        "disk_type": None,
+        "default_cpu": 1,
+        "default_ram_mb": 1024,
+        "default_disk_gb": 10,
+        "config_script": None,
+        "tags": ["target", "workstation", "victim"],
+    },
+    {
+        "name": "Samba DC",
+        "description": "Samba 4 Active Directory Domain Controller",
+        "os_type": "linux",
+        "os_variant": "Ubuntu 22.04",
+        "base_image": "cyroid/samba-dc:latest",
+        "vm_type": "container",
+        "linux_distro": "ubuntu",
+        "boot_mode": None,
+        "disk_type": None,
+        "default_cpu": 2,
+        "default_ram_mb": 2048,
+        "default_disk_gb": 20,
+        "config_script": None,
+        "tags": ["dc", "samba", "ad"],
+    },
+)
 
 
 def get_templates():
     """Return template definitions."""
-    return [
-        {
-            "name": "Red Team - Kali Attack Box",
-            "description": "Kali Linux with pre-installed attack tools",
-            "os_type": "linux",
-            "os_variant": "Kali Linux",
-            "base_image": "redteam-lab-kali:latest",
-            "vm_type": "container",
-            "linux_distro": "kali",
-            "boot_mode": None,
-            "disk_type": None,
-            "default_cpu": 4,
-            "default_ram_mb": 4096,
-            "default_disk_gb": 60,
-            "config_script": None,
-            "tags": ["attack", "kali", "red-team"],
-        },
-        {
-            "name": "Red Team - Redirector",
-            "description": "Lightweight Alpine redirector for C2 traffic",
-            "os_type": "linux",
-            "os_variant": "Alpine Linux",
-            "base_image": "alpine:latest",
-            "vm_type": "container",
-            "linux_distro": "alpine",
-            "boot_mode": None,
-            "disk_type": None,
-            "default_cpu": 1,
-            "default_ram_mb": 512,
-            "default_disk_gb": 10,
-            "config_script": "apk add --no-cache socat iptables && echo 1 > /proc/sys/net/ipv4/ip_forward",
-            "tags": ["redirector", "c2", "red-team"],
-        },
-        {
-            "name": "Red Team - WordPress Target",
-            "description": "WordPress with SQL injection vulnerabilities",
-            "os_type": "linux",
-            "os_variant": "Ubuntu 22.04",
-            "base_image": "redteam-lab-wordpress:latest",
-            "vm_type": "container",
-            "linux_distro": "ubuntu",
-            "boot_mode": None,
-            "disk_type": None,
-            "default_cpu": 2,
-            "default_ram_mb": 2048,
-            "default_disk_gb": 20,
-            "config_script": None,
-            "tags": ["target", "wordpress", "sqli"],
-        },
-        {
-            "name": "Red Team - File Server",
-            "description": "Samba file server with sensitive data",
-            "os_type": "linux",
-            "os_variant": "Ubuntu 22.04",
-            "base_image": "redteam-lab-fileserver:latest",
-            "vm_type": "container",
-            "linux_distro": "ubuntu",
-            "boot_mode": None,
-            "disk_type": None,
-            "default_cpu": 1,
-            "default_ram_mb": 1024,
-            "default_disk_gb": 10,
-            "config_script": None,
-            "tags": ["target", "fileserver", "smb"],
-        },
-        {
-            "name": "Red Team - Victim Workstation",
-            "description": "Simulated workstation that browses web periodically",
-            "os_type": "linux",
-            "os_variant": "Ubuntu 22.04",
-            "base_image": "redteam-lab-workstation:latest",
-            "vm_type": "container",
-            "linux_distro": "ubuntu",
-            "boot_mode": None,
-            "disk_type": None,
-            "default_cpu": 1,
-            "default_ram_mb": 1024,
-            "default_disk_gb": 10,
-            "config_script": None,
-            "tags": ["target", "workstation", "victim"],
-        },
-        {
-            "name": "Samba DC",
-            "description": "Samba 4 Active Directory Domain Controller",
-            "os_type": "linux",
-            "os_variant": "Ubuntu 22.04",
-            "base_image": "cyroid/samba-dc:latest",
-            "vm_type": "container",
-            "linux_distro": "ubuntu",
-            "boot_mode": None,
-            "disk_type": None,
-            "default_cpu": 2,
-            "default_ram_mb": 2048,
-            "default_disk_gb": 20,
-            "config_script": None,
-            "tags": ["dc", "samba", "ad"],
-        },
-    ]
+    return _TEMPLATES
 
 
 # Map template base_image to container directory
@@ -210,13 +239,194 @@ IMAGE_TO_DIR = {
 }
 
 
+# Characters replaced when turning image/template names into archive paths
+_SAFE_TABLE = str.maketrans({"/": "_", ":": "_", " ": "_"})
+
+
 def safe_image_name(image_name: str) -> str:
     """Convert image name to safe directory name."""
-    return image_name.replace("/", "_").replace(":", "_")
-
+    return image_name.translate(_SAFE_TABLE)
+
+
+def compile_dockerignore_pattern(pattern: str):
+    """Compile one .dockerignore pattern to a regex, using Docker's rules.
+
+    "*", "?" and "[...]" match within a single path segment; only "**"
+    spans directories ("**/" also matches zero directories).
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            chars = pattern[i + 1:end].replace("\\", "\\\\")
+            if chars[0] in "!^":
+                chars = "^" + chars[1:]
+            out.append(f"[{chars}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def load_dockerignore(container_dir: Path) -> list:
+    """Return (compiled pattern, negate) rules from a container's .dockerignore, if any."""
+    ignore_file = container_dir / ".dockerignore"
+    if not ignore_file.is_file():
+        return []
+
+    rules = []
+    for line in ignore_file.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        pattern = line.lstrip("!").strip().lstrip("/").rstrip("/")
+        if pattern.startswith("./"):
+            pattern = pattern[2:]
+        rules.append((compile_dockerignore_pattern(pattern), negate))
+    return rules
+
+
+def is_ignored(rel_path: str, rules: list) -> bool:
+    """Check a context-relative path against the default ignores and .dockerignore rules.
+
+    Patterns are anchored at the context root, so "*.md" only matches
+    top-level files:
+
+    >>> rules = [(compile_dockerignore_pattern("*.md"), False)]
+    >>> is_ignored("README.md", rules), is_ignored("docs/README.md", rules)
+    (True, False)
+    >>> rules = [(compile_dockerignore_pattern("**/*.md"), False)]
+    >>> is_ignored("README.md", rules), is_ignored("docs/README.md", rules)
+    (True, True)
+    >>> rules = [(compile_dockerignore_pattern("build"), False),
+    ...          (compile_dockerignore_pattern("build/keep.txt"), True)]
+    >>> is_ignored("build/out.o", rules), is_ignored("build/keep.txt", rules)
+    (True, False)
+
+    The root Dockerfile and .dockerignore are always kept, as docker build
+    sends them even when listed:
+
+    >>> rules = [(compile_dockerignore_pattern(p), False) for p in ("Dockerfile", ".dockerignore", "*")]
+    >>> is_ignored("Dockerfile", rules), is_ignored(".dockerignore", rules), is_ignored("x.sh", rules)
+    (False, False, True)
+    """
+    if rel_path in ALWAYS_IN_CONTEXT:
+        return False
 
-def copy_dockerfile_context(image_name: str, dest_dir: Path) -> bool:
-    """Copy Dockerfile and context for an image."""
+    parts = rel_path.split("/")
+    if DEFAULT_CONTEXT_IGNORE.intersection(parts):
+        return True
+
+    # As with docker build: a pattern matching a directory excludes everything
+    # under it, and the last matching rule wins
+    prefixes = ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+    ignored = False
+    for pattern, negate in rules:
+        if any(pattern.match(prefix) for prefix in prefixes):
+            ignored = not negate
+    return ignored
+
+
+def iter_context_files(container_dir: Path, rules: list, skipped: list, rel_dir: str = "",
+                       _ancestors: frozenset = frozenset()):
+    """Yield (rel_path, path) for files to package, in sorted order.
+
+    Ignored directories are pruned without being walked, unless a "!" rule
+    could re-include something inside them. Symlinked directories are
+    followed (as copytree did) unless they point back at an ancestor.
+    Ignored, looping and unreadable entries go into `skipped`.
+    """
+    has_exceptions = any(negate for _, negate in rules)
+    current = container_dir / rel_dir if rel_dir else container_dir
+    ancestors = _ancestors | {os.path.realpath(current)}
+    with os.scandir(current) as it:
+        entries = sorted(it, key=lambda e: e.name)
+
+    for entry in entries:
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        if entry.is_dir():
+            if entry.name in DEFAULT_CONTEXT_IGNORE or (
+                    not has_exceptions and is_ignored(rel_path, rules)):
+                skipped.append(entry)
+                continue
+            if entry.is_symlink() and os.path.realpath(entry.path) in ancestors:
+                print(f"    Warning: not following {rel_path} (symlink loop)")
+                skipped.append(entry)
+                continue
+            yield from iter_context_files(container_dir, rules, skipped, rel_path, ancestors)
+        elif entry.is_file():
+            if is_ignored(rel_path, rules):
+                skipped.append(entry)
+                continue
+            yield rel_path, Path(entry.path)
+        else:
+            # Broken symlink, socket, FIFO, ...
+            skipped.append(entry)
+
+
+def set_compress_level(info: zipfile.ZipInfo, level: int):
+    """Set a ZipInfo's compression level, for entries written via zf.open()."""
+    if hasattr(info, "compress_level"):
+        info.compress_level = level  # Python 3.13+
+    else:
+        info._compresslevel = level  # no public attribute before 3.13
+
+
+def make_zip_info(arcname: str, path: Path = None) -> zipfile.ZipInfo:
+    """Build a fresh ZipInfo with a fixed timestamp (and the source file's mode)."""
+    if path is not None:
+        info = zipfile.ZipInfo.from_file(path, arcname)
+        info.date_time = ZIP_DATE_TIME
+    else:
+        info = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+        info.external_attr = (stat.S_IFREG | 0o644) << 16
+    info.compress_type = ZIP_COMPRESSION
+    return info
+
+
+def write_entry(zf: zipfile.ZipFile, info: zipfile.ZipInfo, data, checksums: dict):
+    """Write an archive entry and record its SHA-256 checksum."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    checksums[info.filename] = hashlib.sha256(data).hexdigest()
+    zf.writestr(info, data, compresslevel=ZIP_COMPRESSLEVEL)
+
+
+def write_file_entry(zf: zipfile.ZipFile, info: zipfile.ZipInfo, path: Path, checksums: dict):
+    """Stream a file into the archive, hashing it in the same pass.
+
+    Memory use stays at one chunk however large the file is. ZIP64 is
+    enabled automatically from the file size recorded in `info`.
+    """
+    set_compress_level(info, ZIP_COMPRESSLEVEL)  # zf.open() ignores the archive default
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as src, zf.open(info, "w") as dst:
+        while chunk := src.read(COPY_CHUNK_SIZE):
+            sha256.update(chunk)
+            dst.write(chunk)
+    checksums[info.filename] = sha256.hexdigest()
+
+
+def add_dockerfile_context(zf: zipfile.ZipFile, image_name: str, checksums: dict) -> bool:
+    """Add Dockerfile and context for an image to the archive."""
     if image_name not in IMAGE_TO_DIR:
         return False
 
@@ -226,11 +436,19 @@ def copy_dockerfile_context(image_name: str, dest_dir: Path) -> bool:
         return False
 
     safe_name = safe_image_name(image_name)
-    image_dest = dest_dir / safe_name
 
-    # Copy the entire container directory
-    shutil.copytree(container_dir, image_dest)
-    print(f"  Copied {container_dir} -> dockerfiles/{safe_name}/")
+    rules = load_dockerignore(container_dir)
+    skipped = []
+
+    # Add the container directory (file modes are kept, e.g. +x on scripts)
+    for rel_path, path in iter_context_files(container_dir, rules, skipped):
+        arcname = f"dockerfiles/{safe_name}/{rel_path}"
+        write_file_entry(zf, make_zip_info(arcname, path), path, checksums)
+    print(f"  Added {container_dir} -> dockerfiles/{safe_name}/")
+    if skipped:
+        names = ", ".join(e.name + ("/" if e.is_dir() else "") for e in skipped[:5])
+        more = f", +{len(skipped) - 5} more" if len(skipped) > 5 else ""
+        print(f"    Skipped ignored: {names}{more}")
     return True
 
 
@@ -238,81 +456,73 @@ def main():
     print("Packaging Red Team Training Lab Blueprint")
     print("=" * 50)
 
-    # Create temp directory for packaging
-    temp_dir = Path(tempfile.mkdtemp(prefix="rtl-blueprint-"))
+    # Get blueprint and templates
+    blueprint = get_blueprint_config()
+    templates = get_templates()
+
+    # Create manifest; checksums are filled in as entries are written
+    checksums = {}
+    manifest = {
+        "version": "1.0",
+        "export_type": "blueprint",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "created_by": "red-team-training-lab",
+        "blueprint_name": blueprint["name"],
+        "template_count": len(templates),
+        "checksums": checksums,
+    }
+
+    # Create full export structure. The embedded manifest keeps an empty
+    # checksums dict, as before: blueprint.json can't contain its own hash,
+    # so manifest.json is the only authoritative checksum list.
+    export_data = {
+        "manifest": {**manifest, "checksums": {}},
+        "blueprint": blueprint,
+        "templates": templates,
+    }
+
+    # Write everything straight into a new ZIP next to the output, and only
+    # replace the existing archive once it has been written completely
+    output_path = OUTPUT_DIR / "red-team-training-lab.blueprint.zip"
+    tmp_path = output_path.with_suffix(".zip.tmp")
+    print(f"\nCreating ZIP archive: {output_path}")
 
     try:
-        # Get blueprint and templates
-        blueprint = get_blueprint_config()
-        templates = get_templates()
-
-        # Create manifest
-        manifest = {
-            "version": "1.0",
-            "export_type": "blueprint",
-            "created_at": datetime.utcnow().isoformat() + "Z",
-            "created_by": "red-team-training-lab",
-            "blueprint_name": blueprint["name"],
-            "template_count": len(templates),
-            "checksums": {},
-        }
-
-        # Create full export structure
-        export_data = {
-            "manifest": manifest,
-            "blueprint": blueprint,
-            "templates": templates,
-        }
-
-        # Write blueprint.json
-        print("\nWriting blueprint.json...")
-        blueprint_json = json.dumps(export_data, indent=2)
-        (temp_dir / "blueprint.json").write_text(blueprint_json)
-
-        # Write manifest.json
-        print("Writing manifest.json...")
-        (temp_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
-
-        # Write individual template files
-        templates_dir = temp_dir / "templates"
-        templates_dir.mkdir()
-        print("Writing template files...")
-        for template in templates:
-            safe_name = template["name"].replace("/", "_").replace(" ", "_")
-            (templates_dir / f"{safe_name}.json").write_text(json.dumps(template, indent=2))
-
-        # Copy Dockerfiles
-        print("\nCopying Dockerfiles...")
-        dockerfiles_dir = temp_dir / "dockerfiles"
-        dockerfiles_dir.mkdir()
-
-        for template in templates:
-            image = template.get("base_image")
-            if image and image in IMAGE_TO_DIR:
-                copy_dockerfile_context(image, dockerfiles_dir)
-
-        # Create ZIP archive
-        output_path = OUTPUT_DIR / "red-team-training-lab.blueprint.zip"
-        print(f"\nCreating ZIP archive: {output_path}")
-
-        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    arcname = file_path.relative_to(temp_dir)
-                    zf.write(file_path, arcname)
-
-        # Show archive contents
-        print("\nArchive contents:")
-        with zipfile.ZipFile(output_path, "r") as zf:
+        with zipfile.ZipFile(tmp_path, "w", ZIP_COMPRESSION, compresslevel=ZIP_COMPRESSLEVEL) as zf:
+            # Write individual template files
+            print("\nWriting template files...")
+            for template in templates:
+                safe_name = template["name"].translate(_SAFE_TABLE)
+                write_entry(zf, make_zip_info(f"templates/{safe_name}.json"),
+                            json.dumps(template, indent=2), checksums)
+
+            # Add Dockerfiles, once per image even if several templates share it
+            print("\nAdding Dockerfiles...")
+            for image in dict.fromkeys(t.get("base_image") for t in templates):
+                add_dockerfile_context(zf, image, checksums)
+
+            # manifest.json goes last so it carries the checksums of every
+            # other entry. blueprint.json is only read by CYROID, so it is
+            # written compact.
+            print("\nWriting blueprint.json...")
+            write_entry(zf, make_zip_info("blueprint.json"),
+                        json.dumps(export_data, separators=(",", ":")), checksums)
+
+            print("Writing manifest.json...")
+            zf.writestr(make_zip_info("manifest.json"), json.dumps(manifest, indent=2),
+                        compresslevel=ZIP_COMPRESSLEVEL)
+
+            # Show archive contents
+            print("\nArchive contents:")
             for info in zf.infolist():
                 print(f"  {info.filename} ({info.file_size} bytes)")
 
-        print(f"\n✓ Blueprint created: {output_path}")
-        print(f"  Size: {output_path.stat().st_size / 1024:.1f} KB")
-
+        os.replace(tmp_path, output_path)
     finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        tmp_path.unlink(missing_ok=True)
+
+    print(f"\n✓ Blueprint created: {output_path}")
+    print(f"  Size: {output_path.stat().st_size / 1024:.1f} KB")
 
 
 if __name__ == "__main__":